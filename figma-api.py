@@ -1,9 +1,39 @@
 import requests
+from requests.adapters import HTTPAdapter
 import os
+import sys
 import time
 import json
+import random
+import hashlib
+import atexit
+import collections
+import contextlib
+import functools
+import gzip
+import itertools
 import logging
-from typing import Dict, List, Optional, Any, Union
+import pathlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import BinaryIO, Dict, Iterator, List, Optional, Any, Tuple, Union
+from urllib.parse import urlencode
+
+try:
+    import orjson  # Optional: much faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+try:
+    import brotli  # noqa: F401  Optional: lets urllib3 decode brotli-compressed responses
+    ACCEPT_ENCODING = "br, gzip, deflate"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+try:
+    import zstandard as zstd  # Optional: zstd compression for the consolidated output
+except ImportError:
+    zstd = None
 
 # ANSI color codes for terminal output
 class LogColors:
@@ -75,11 +105,147 @@ logger = setup_colored_logging()
 
 FIGMA_ACCESS_TOKEN: Optional[str] = os.environ.get("FIGMA_ACCESS_TOKEN", None)
 
+# HTTP connection pool settings for the shared session
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 32
+REQUEST_TIMEOUT = (5, 30)  # (connect, read) in seconds
+
+FIGMA_API_BASE_URL = "https://api.figma.com/v1/"
+
+# Pre-built URL templates for the endpoints called once per team, project or file
+_URL_TEAM_PROJECTS = (FIGMA_API_BASE_URL + "teams/{}/projects").format
+_URL_PROJECT_FILES = (FIGMA_API_BASE_URL + "projects/{}/files").format
+_URL_FILE = (FIGMA_API_BASE_URL + "files/{}").format
+
+# Buffer size for streaming large output files to disk
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Optional compression for the consolidated output: file suffix per method, and compression levels
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+GZIP_COMPRESSLEVEL = 6
+ZSTD_LEVEL = 3
+
+# Directory for cached API responses, revalidated with ETag/If-None-Match on later runs
+CACHE_DIR = ".figma_cache"
+
+# Retry back-off settings: delay doubles per attempt, capped, with random jitter on top
+INITIAL_RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 30.0
+JITTER = 0.5
+DEFAULT_RETRY_AFTER = 60  # seconds to wait on a 429 without a usable Retry-After header
+
+# Response statuses worth retrying; any other error status fails fast
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Number of concurrent project file fetches per team (must not exceed POOL_MAXSIZE)
+PROJECT_FETCH_WORKERS = 8
+
+# Number of teams fetched concurrently in save_all_data_to_single_json; each runs its own
+# project pool, and MAX_CONCURRENT_REQUESTS keeps the combined load within the session pool
+TEAM_FETCH_WORKERS = 16
+
+# Most teams fetched ahead of the one being written, which bounds how many finished teams
+# can sit in memory while an earlier, slower team is still being fetched
+TEAM_FETCH_WINDOW = 2 * TEAM_FETCH_WORKERS
+
+# Upper bound on in-flight requests across all worker threads, so concurrent
+# fetches never open more connections than the session pool keeps alive
+MAX_CONCURRENT_REQUESTS = POOL_MAXSIZE
+
+# Scalar fields shared by every failed project / team entry; each entry adds its own
+# fresh empty "files" / "projects" list so no list is shared between entries
+ERR_PROJECT = {"error": True, "file_count": 0}
+ERR_TEAM = {"error": True, "project_count": 0, "total_files": 0}
+
+def create_session() -> requests.Session:
+    """
+    Create an HTTP session set up for the Figma API: pooled keep-alive connections to
+    api.figma.com and compressed responses. The token header is added on first use.
+    Retries are handled by figma_api_get, so the adapter itself never retries.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0))
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    return session
+
+# Shared session so repeated calls to api.figma.com reuse keep-alive connections
+_SESSION = create_session()
+
+# Serializes token resolution, so concurrent first requests prompt for the token only once
+_token_lock = threading.Lock()
+
+@contextlib.contextmanager
+def _atomic_write(filename: str, buffering: int = -1) -> Iterator[BinaryIO]:
+    """
+    Open a temporary file next to filename for binary writing. On success it is fsynced once and
+    atomically renamed over filename, so readers never see a partially written file; on failure
+    the temporary file is removed and filename is left untouched.
+    """
+    tmp_filename = f"{filename}.tmp"
+    try:
+        with open(tmp_filename, 'wb', buffering=buffering) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_filename)
+        raise
+
+@contextlib.contextmanager
+def _compressed_writer(raw: BinaryIO, compress: Optional[str] = None) -> Iterator[BinaryIO]:
+    """
+    Wrap raw in a gzip or zstd compressor (or return it unchanged when compress is None).
+    Closing the compressor finishes the compressed stream but leaves raw open.
+    """
+    if compress is None:
+        yield raw
+    elif compress == "gzip":
+        with gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=GZIP_COMPRESSLEVEL) as f:
+            yield f
+    else:
+        # threads=-1 compresses on one worker thread per CPU, overlapping compression with writes
+        cctx = zstd.ZstdCompressor(level=ZSTD_LEVEL, threads=-1)
+        with cctx.stream_writer(raw, closefd=False) as f:
+            yield f
+
+def _json_dumps(data: Any, indent: bool = True) -> bytes:
+    """
+    Serialize data to UTF-8 encoded JSON, using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+def _json_loads(content: bytes) -> Any:
+    """
+    Parse UTF-8 encoded JSON, using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def _write_json_file(filename: str, data: Any, indent: bool = True) -> int:
+    """
+    Write data to a JSON file in a single serialization pass.
+
+    Returns:
+        int: Number of bytes written
+    """
+    payload = _json_dumps(data, indent)
+    with open(filename, 'wb') as f:
+        f.write(payload)
+    return len(payload)
+
+@functools.lru_cache(maxsize=1)
 def get_access_token() -> str:
     """
     Get the Figma access token from global constant or prompt the user.
+    The token is resolved once and cached for the rest of the run.
     """
-    logger.debug("Getting Figma access token")
     token = FIGMA_ACCESS_TOKEN
     if not token:
         logger.info("No token found in environment, prompting user")
@@ -90,50 +256,205 @@ def get_access_token() -> str:
     logger.debug("Token obtained successfully")
     return token
 
-def figma_api_get(endpoint: str, params: Optional[Dict[str, Any]] = None, max_retries: int = 3) -> Dict[str, Any]:
+def get_session(session: Optional[requests.Session] = None) -> requests.Session:
+    """
+    Get the HTTP session to send API requests with, setting the Figma token header on first use.
+    Uses the shared session unless another one (e.g. from create_session()) is given.
+    """
+    if session is None:
+        session = _SESSION
+    if "X-Figma-Token" not in session.headers:
+        with _token_lock:
+            if "X-Figma-Token" not in session.headers:
+                session.headers["X-Figma-Token"] = get_access_token()
+    return session
+
+def close_session() -> None:
+    """
+    Close the shared HTTP session and release its pooled connections.
+    """
+    logger.debug("Closing HTTP session")
+    _SESSION.close()
+
+atexit.register(close_session)
+
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+# Shared rate-limit state so concurrent workers back off together on 429 responses
+_rate_limit_lock = threading.Lock()
+_rate_limited_until = 0.0
+
+def _wait_for_rate_limit() -> None:
+    """
+    Block until any rate-limit back-off requested by another worker has elapsed.
+    Each waiter adds its own random jitter, so workers resume spread out instead of all at once.
+    """
+    with _rate_limit_lock:
+        delay = _rate_limited_until - time.time()
+    if delay > 0:
+        delay *= 1 + random.random() * JITTER
+        logger.debug(f"Waiting {delay:.1f} seconds for rate limit back-off")
+        time.sleep(delay)
+
+def _set_rate_limited(retry_after: float) -> None:
+    """
+    Ask all workers to hold off requests for the given number of seconds.
+    """
+    global _rate_limited_until
+    with _rate_limit_lock:
+        _rate_limited_until = max(_rate_limited_until, time.time() + retry_after)
+
+def _parse_retry_after(headers: Any) -> int:
+    """
+    Read the Retry-After delay in seconds, falling back to DEFAULT_RETRY_AFTER
+    when the header is missing or not a plain number of seconds.
+    """
+    if "Retry-After" in headers:
+        value = headers["Retry-After"].strip()
+        if value.isdigit():
+            return int(value)
+    return DEFAULT_RETRY_AFTER
+
+def _retry_delay(attempt: int) -> float:
+    """
+    Exponential back-off delay with jitter for the given zero-based attempt.
+    """
+    delay = min(INITIAL_RETRY_DELAY * (2.0 ** attempt), MAX_RETRY_DELAY)
+    return delay * (1 + random.random() * JITTER)
+
+def _cache_paths(url: str, params: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+    """
+    Get the cached body and ETag file paths for a request.
+    """
+    key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+    base = os.path.join(CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest())
+    return f"{base}.json", f"{base}.etag"
+
+def _read_cached_etag(etag_path: str) -> Optional[str]:
+    """
+    Read the ETag stored for a cached response, if any.
+    """
+    try:
+        with open(etag_path, 'r') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+def _store_cached_response(body_path: str, etag_path: str, content: bytes, etag: str) -> None:
+    """
+    Store a response body and its ETag so the next run can send a conditional request.
+    The body is written first so an ETag file always has a complete body next to it.
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        for path, data in ((body_path, content), (etag_path, etag.encode("utf-8"))):
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not cache response: {str(e)}")
+
+def figma_api_get(endpoint: str, params: Optional[Dict[str, Any]] = None, max_retries: int = 3,
+                  use_cache: bool = True, session: Optional[requests.Session] = None) -> Dict[str, Any]:
     """
     Generic GET request to the Figma API with retries.
+    See _figma_api_get_url for retry and caching behavior.
     """
-    token = get_access_token()
-    url = f"https://api.figma.com/v1/{endpoint}"
-    headers = {
-        "X-Figma-Token": token
-    }
+    return _figma_api_get_url(FIGMA_API_BASE_URL + endpoint, params, max_retries, use_cache, session)
+
+def _figma_api_get_url(url: str, params: Optional[Dict[str, Any]] = None, max_retries: int = 3,
+                       use_cache: bool = True, session: Optional[requests.Session] = None) -> Dict[str, Any]:
+    """
+    GET a full Figma API URL with retries.
+
+    Only transient failures consume a retry: connection errors, timeouts and the statuses
+    in RETRYABLE_STATUS_CODES are retried with exponential back-off and jitter, and 429
+    responses honor the Retry-After header. Other 4xx/5xx responses (e.g. 401/403/404 for a
+    wrong token or team ID) and any other request errors are returned immediately.
+
+    If every attempt is rate limited, the returned error dict has "rate_limited" set.
+
+    With use_cache, responses that carry an ETag are cached under CACHE_DIR and later
+    requests send If-None-Match; a 304 Not Modified reply returns the cached body.
+
+    Requests go through the shared pooled session unless another session is given.
+    """
+    session = get_session(session)
+    body_path, etag_path = _cache_paths(url, params)
+    cached_etag = _read_cached_etag(etag_path) if use_cache else None
 
     logger.info(f"Making API request to: {url}")
-    if params:
+    if params and logger.isEnabledFor(logging.DEBUG):
         logger.debug(f"Request params: {json.dumps(params)}")
 
+    rate_limited = False
     for attempt in range(max_retries):
+        _wait_for_rate_limit()
         try:
             logger.debug(f"Attempt {attempt + 1}/{max_retries}")
-            resp = requests.get(url, headers=headers, params=params)
+            headers = {"If-None-Match": cached_etag} if cached_etag else None
+            with _request_slots:
+                resp = session.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
             logger.debug(f"Response status code: {resp.status_code}")
 
-            if resp.status_code == 200:
-                logger.info(f"Request to {endpoint} successful")
-                logger.debug(f"Response headers: {dict(resp.headers)}")
-                response_data = resp.json()
-                logger.debug(f"Received {len(json.dumps(response_data))} bytes of data")
+            if resp.status_code == 304 and cached_etag:  # Not modified since the cached copy
+                try:
+                    with open(body_path, 'rb') as f:
+                        response_data = _json_loads(f.read())
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Cached response for {url} is unreadable, refetching: {str(e)}")
+                    cached_etag = None
+                    continue
+                logger.info(f"Request to {url} not modified, using cached response")
+                return response_data
+            elif resp.status_code == 200:
+                logger.info(f"Request to {url} successful")
+                response_data = _json_loads(resp.content)
+                etag = resp.headers.get("ETag")
+                if use_cache and etag:
+                    _store_cached_response(body_path, etag_path, resp.content, etag)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Response headers: %s", resp.headers)
+                    logger.debug(f"Received {len(resp.content)} bytes of data")
+                    encoding = resp.headers.get("Content-Encoding")
+                    wire_size = int(resp.headers.get("Content-Length") or 0)
+                    if encoding and wire_size:
+                        logger.debug(f"Response was {encoding}-encoded: {wire_size} bytes on the wire "
+                                     f"({len(resp.content) / wire_size:.1f}x compression)")
                 return response_data
             elif resp.status_code == 429:  # Rate limited
-                retry_after = int(resp.headers.get('Retry-After', 60))
-                logger.warning(f"Rate limited. Waiting for {retry_after} seconds before retry...")
-                time.sleep(retry_after)
+                retry_after = _parse_retry_after(resp.headers)
+                logger.warning(f"Rate limited. Waiting for at least {retry_after} seconds before retry...")
+                rate_limited = True
+                _set_rate_limited(retry_after)
+                continue
+            elif resp.status_code in RETRYABLE_STATUS_CODES and attempt < max_retries - 1:  # Transient error
+                delay = _retry_delay(attempt)
+                logger.warning(f"Transient error {resp.status_code}. Retrying in {delay:.1f} seconds...")
+                time.sleep(delay)
                 continue
             else:
-                logger.error(f"API Error: {resp.status_code} - {resp.text}")
-                return {"error": True, "status_code": resp.status_code, "message": resp.text}
-        except Exception as e:
+                # Figma error bodies are JSON, so decode as UTF-8 instead of letting requests guess the charset
+                message = resp.content.decode("utf-8", errors="replace")
+                logger.error(f"API Error: {resp.status_code} - {message[:256]}")
+                return {"error": True, "status_code": resp.status_code, "message": message}
+        except (requests.ConnectionError, requests.Timeout) as e:
             logger.error(f"Request failed: {str(e)}", exc_info=True)
             if attempt < max_retries - 1:
-                logger.info(f"Retrying... (Attempt {attempt + 1}/{max_retries})")
-                time.sleep(2)
+                delay = _retry_delay(attempt)
+                logger.info(f"Retrying in {delay:.1f} seconds... (Attempt {attempt + 1}/{max_retries})")
+                time.sleep(delay)
             else:
-                logger.error(f"Max retries exceeded for {endpoint}")
+                logger.error(f"Max retries exceeded for {url}")
                 return {"error": True, "status_code": 0, "message": str(e)}
+        except (requests.RequestException, ValueError) as e:  # Not transient, e.g. invalid URL or malformed JSON
+            logger.error(f"Request failed: {str(e)}", exc_info=True)
+            return {"error": True, "status_code": 0, "message": str(e)}
 
-    logger.error(f"All {max_retries} attempts to {endpoint} failed")
+    logger.error(f"All {max_retries} attempts to {url} failed")
+    if rate_limited:
+        return {"error": True, "status_code": 429, "rate_limited": True, "message": "Rate limited, max retries exceeded"}
     return {"error": True, "status_code": 0, "message": "Max retries exceeded"}
 
 def get_user_info() -> Dict[str, Any]:
@@ -151,18 +472,19 @@ def get_user_info() -> Dict[str, Any]:
         logger.error(f"Failed to retrieve user info: {response.get('message')}")
     return response
 
-def get_team_projects(team_id: str) -> Dict[str, Any]:
+def get_team_projects(team_id: str, session: Optional[requests.Session] = None) -> Dict[str, Any]:
     """
     Get all projects in a specific team.
 
     Args:
         team_id (str): The Figma team ID
+        session (requests.Session): Session to send the request with (defaults to the shared session)
 
     Returns:
         dict: JSON response containing all projects in the team
     """
     logger.info(f"Fetching projects for team {team_id}")
-    response = figma_api_get(f"teams/{team_id}/projects")
+    response = _figma_api_get_url(_URL_TEAM_PROJECTS(team_id), session=session)
     if not response.get("error"):
         projects = response.get("projects", [])
         logger.info(f"Successfully retrieved {len(projects)} projects for team {team_id}")
@@ -170,18 +492,19 @@ def get_team_projects(team_id: str) -> Dict[str, Any]:
         logger.error(f"Failed to retrieve projects for team {team_id}: {response.get('message')}")
     return response
 
-def get_files(project_id: str) -> Dict[str, Any]:
+def get_files(project_id: str, session: Optional[requests.Session] = None) -> Dict[str, Any]:
     """
     Get all files in a specific project.
 
     Args:
         project_id (str): The Figma project ID
+        session (requests.Session): Session to send the request with (defaults to the shared session)
 
     Returns:
         dict: JSON response containing all files in the project
     """
     logger.info(f"Fetching files for project {project_id}")
-    response = figma_api_get(f"projects/{project_id}/files")
+    response = _figma_api_get_url(_URL_PROJECT_FILES(project_id), session=session)
     if not response.get("error"):
         files = response.get("files", [])
         logger.info(f"Successfully retrieved {len(files)} files for project {project_id}")
@@ -189,18 +512,31 @@ def get_files(project_id: str) -> Dict[str, Any]:
         logger.error(f"Failed to retrieve files for project {project_id}: {response.get('message')}")
     return response
 
-def get_pages(file_key: str) -> List[Dict[str, Any]]:
+def _page_summary(page: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the summary dict for a CANVAS node returned by the files endpoint.
+    """
+    return {
+        "id": page.get("id"),
+        "name": page.get("name"),
+        "type": "CANVAS",
+        "children_count": len(page.get("children", ())),
+        "background_color": page.get("backgroundColor")
+    }
+
+def get_pages(file_key: str, session: Optional[requests.Session] = None) -> List[Dict[str, Any]]:
     """
     Get all pages in a specific file.
 
     Args:
         file_key (str): The Figma file key
+        session (requests.Session): Session to send the request with (defaults to the shared session)
 
     Returns:
         list: List of page objects containing id, name, and other metadata
     """
     logger.info(f"Fetching pages for file {file_key}")
-    response = figma_api_get(f"files/{file_key}")
+    response = _figma_api_get_url(_URL_FILE(file_key), session=session)
 
     if response and not response.get("error"):
         # Extract pages from the document structure
@@ -209,17 +545,10 @@ def get_pages(file_key: str) -> List[Dict[str, Any]]:
         logger.debug(f"File contains a document with {len(children)} top-level nodes")
 
         # Filter for nodes that are pages (top-level frames in Figma)
-        pages: List[Dict[str, Any]] = []
-        for child in children:
-            if child.get("type") == "CANVAS":
-                pages.append({
-                    "id": child.get("id"),
-                    "name": child.get("name"),
-                    "type": child.get("type"),
-                    "children_count": len(child.get("children", [])),
-                    "background_color": child.get("backgroundColor", None)
-                })
-                logger.debug(f"Found page: {child.get('name')} with {len(child.get('children', []))} elements")
+        pages = [_page_summary(child) for child in children if child.get("type") == "CANVAS"]
+        if logger.isEnabledFor(logging.DEBUG):
+            for page in pages:
+                logger.debug(f"Found page: {page['name']} with {page['children_count']} elements")
 
         logger.info(f"Successfully extracted {len(pages)} pages from file {file_key}")
         return pages
@@ -258,9 +587,8 @@ def save_teams_to_json(output_dir: str = "data") -> str:
         logger.info(f"Will save data to file: {filename}")
 
         # Write the JSON data to file
-        logger.debug(f"Writing {len(json.dumps(teams_data))} bytes to file")
-        with open(filename, 'w') as f:
-            json.dump(teams_data, f, indent=2)
+        written = _write_json_file(filename, teams_data)
+        logger.debug(f"Wrote {written} bytes to file")
 
         success_msg = f"Teams data successfully saved to {filename}"
         logger.info(success_msg)
@@ -271,7 +599,9 @@ def save_teams_to_json(output_dir: str = "data") -> str:
         logger.exception(error_msg)
         return error_msg
 
-def save_team_to_json(team_id: str, team_data: Dict[str, Any], output_dir: str = "data") -> str:
+def save_team_to_json(team_id: str, team_data: Dict[str, Any], output_dir: str = "data", *,
+                      ts: Optional[int] = None, seq: int = 0,
+                      make_dir: bool = True) -> str:
     """
     Save individual team data to a JSON file.
 
@@ -279,22 +609,26 @@ def save_team_to_json(team_id: str, team_data: Dict[str, Any], output_dir: str =
         team_id (str): The team ID
         team_data (dict): The team data to save
         output_dir (str): Directory to save the JSON file
+        ts (int): Batch timestamp for the filename (defaults to now)
+        seq (int): Sequence number within the batch, keeps filenames unique
+        make_dir (bool): Create output_dir if needed; batch callers that already created it pass False
 
     Returns:
         str: Path to the saved JSON file or error message
     """
     try:
-        # Create output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
+        # Create output directory if it doesn't exist (batch callers create it once up front)
+        if make_dir:
+            os.makedirs(output_dir, exist_ok=True)
 
-        # Create filename with team ID and timestamp
-        timestamp = int(time.time())
-        filename = os.path.join(output_dir, f"team_{team_id}_{timestamp}.json")
-        logger.info(f"Saving team {team_id} to file: {filename}")
+        # Create filename with team ID, batch timestamp and sequence number
+        timestamp = int(time.time()) if ts is None else ts
+        filename = os.path.join(output_dir, f"team_{team_id}_{timestamp}_{seq}.json")
+        logger.info("Saving team %s to file: %s", team_id, filename)
 
         # Write the JSON data to file
-        with open(filename, 'w') as f:
-            json.dump(team_data, f, indent=2)
+        written = _write_json_file(filename, team_data)
+        logger.debug("Wrote %d bytes to file", written)
 
         success_msg = f"Team {team_id} data saved to {filename}"
         logger.info(success_msg)
@@ -331,11 +665,11 @@ def get_teams_from_file(team_ids_file: str = "team_ids") -> Dict[str, Any]:
                 team_id = line.strip()
                 if team_id and not team_id.startswith('#'):  # Skip empty lines and comments
                     team_ids.append(team_id)
-                    logger.debug(f"Line {line_num}: Added team ID {team_id}")
+                    logger.debug("Line %d: Added team ID %s", line_num, team_id)
                 elif team_id.startswith('#'):
-                    logger.debug(f"Line {line_num}: Skipped comment line")
+                    logger.debug("Line %d: Skipped comment line", line_num)
                 else:
-                    logger.debug(f"Line {line_num}: Skipped empty line")
+                    logger.debug("Line %d: Skipped empty line", line_num)
 
         logger.info(f"Found {len(team_ids)} team IDs in file")
 
@@ -391,9 +725,10 @@ def save_teams_from_file_to_json(team_ids_file: str = "team_ids", output_dir: st
 
         # Process each team individually
         saved_files = []
+        batch_ts = int(time.time())
 
         for i, team_id in enumerate(team_ids, 1):
-            logger.info(f"Processing team {i}/{len(team_ids)}: {team_id}")
+            logger.info("Processing team %d/%d: %s", i, len(team_ids), team_id)
 
             # Get team projects (this gives us team info + projects)
             team_response = get_team_projects(team_id)
@@ -408,14 +743,14 @@ def save_teams_from_file_to_json(team_ids_file: str = "team_ids", output_dir: st
                 }
 
                 # Save individual team file
-                saved_file = save_team_to_json(team_id, team_data, output_dir)
+                saved_file = save_team_to_json(team_id, team_data, output_dir, ts=batch_ts, seq=i, make_dir=False)
                 if not saved_file.startswith("Failed"):
                     saved_files.append(saved_file)
                     results["successful_teams"] += 1
-                    logger.info(f"Successfully processed team {team_id} with {team_data['project_count']} projects")
+                    logger.info("Successfully processed team %s with %d projects", team_id, team_data["project_count"])
                 else:
                     results["failed_teams"] += 1
-                    logger.error(f"Failed to save team {team_id}: {saved_file}")
+                    logger.error("Failed to save team %s: %s", team_id, saved_file)
 
                 results["processed_teams"].append({
                     "id": team_id,
@@ -424,7 +759,7 @@ def save_teams_from_file_to_json(team_ids_file: str = "team_ids", output_dir: st
                     "file": saved_file if not saved_file.startswith("Failed") else None
                 })
             else:
-                logger.error(f"Failed to get data for team {team_id}: {team_response.get('message')}")
+                logger.error("Failed to get data for team %s: %s", team_id, team_response.get("message"))
                 results["failed_teams"] += 1
 
                 # Save error info to file as well
@@ -438,7 +773,7 @@ def save_teams_from_file_to_json(team_ids_file: str = "team_ids", output_dir: st
                     "source": team_ids_file
                 }
 
-                saved_file = save_team_to_json(team_id, error_data, output_dir)
+                saved_file = save_team_to_json(team_id, error_data, output_dir, ts=batch_ts, seq=i, make_dir=False)
                 if not saved_file.startswith("Failed"):
                     saved_files.append(saved_file)
 
@@ -456,9 +791,9 @@ def save_teams_from_file_to_json(team_ids_file: str = "team_ids", output_dir: st
             "timestamp": time.time()
         }
 
-        summary_filename = os.path.join(output_dir, f"teams_summary_{int(time.time())}.json")
-        with open(summary_filename, 'w') as f:
-            json.dump(summary_data, f, indent=2)
+        summary_filename = os.path.join(output_dir, f"teams_summary_{batch_ts}.json")
+        written = _write_json_file(summary_filename, summary_data)
+        logger.debug(f"Wrote {written} bytes to summary file")
 
         success_msg = (f"Processed {len(team_ids)} teams: "
                       f"{results['successful_teams']} successful, "
@@ -474,7 +809,9 @@ def save_teams_from_file_to_json(team_ids_file: str = "team_ids", output_dir: st
         logger.exception(error_msg)
         return error_msg
 
-def save_project_files_to_json(project_id: str, project_data: Dict[str, Any], output_dir: str = "data") -> str:
+def save_project_files_to_json(project_id: str, project_data: Dict[str, Any], output_dir: str = "data", *,
+                               ts: Optional[int] = None, seq: int = 0,
+                               make_dir: bool = True) -> str:
     """
     Save individual project files data to a JSON file.
 
@@ -482,22 +819,26 @@ def save_project_files_to_json(project_id: str, project_data: Dict[str, Any], ou
         project_id (str): The project ID
         project_data (dict): The project files data to save
         output_dir (str): Directory to save the JSON file
+        ts (int): Batch timestamp for the filename (defaults to now)
+        seq (int): Sequence number within the batch, keeps filenames unique
+        make_dir (bool): Create output_dir if needed; batch callers that already created it pass False
 
     Returns:
         str: Path to the saved JSON file or error message
     """
     try:
-        # Create output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
+        # Create output directory if it doesn't exist (batch callers create it once up front)
+        if make_dir:
+            os.makedirs(output_dir, exist_ok=True)
 
-        # Create filename with project ID and timestamp
-        timestamp = int(time.time())
-        filename = os.path.join(output_dir, f"project_files_{project_id}_{timestamp}.json")
-        logger.info(f"Saving project {project_id} files to file: {filename}")
+        # Create filename with project ID, batch timestamp and sequence number
+        timestamp = int(time.time()) if ts is None else ts
+        filename = os.path.join(output_dir, f"project_files_{project_id}_{timestamp}_{seq}.json")
+        logger.info("Saving project %s files to file: %s", project_id, filename)
 
         # Write the JSON data to file
-        with open(filename, 'w') as f:
-            json.dump(project_data, f, indent=2)
+        written = _write_json_file(filename, project_data)
+        logger.debug("Wrote %d bytes to file", written)
 
         success_msg = f"Project {project_id} files data saved to {filename}"
         logger.info(success_msg)
@@ -508,13 +849,40 @@ def save_project_files_to_json(project_id: str, project_data: Dict[str, Any], ou
         logger.exception(error_msg)
         return error_msg
 
-def save_teams_with_project_files_to_json(team_ids_file: str = "team_ids", output_dir: str = "data") -> str:
+def save_records_ndjson(records: List[Dict[str, Any]], path: str) -> str:
+    """
+    Append records to a newline-delimited JSON (NDJSON) file, one record per line.
+    The file is opened once for the whole batch.
+
+    Args:
+        records (list): The records to append
+        path (str): Path to the NDJSON file (created if it doesn't exist)
+
+    Returns:
+        str: Path to the NDJSON file or error message
+    """
+    try:
+        with open(path, 'ab') as f:
+            f.writelines(_json_dumps(record, indent=False) + b"\n" for record in records)
+
+        logger.info("Appended %d records to %s", len(records), path)
+        return path
+
+    except Exception as e:
+        error_msg = f"Failed to append records to {path}: {str(e)}"
+        logger.exception(error_msg)
+        return error_msg
+
+def save_teams_with_project_files_to_json(team_ids_file: str = "team_ids", output_dir: str = "data",
+                                          per_project_files: bool = False) -> str:
     """
     Read team IDs from file and save each team's data with all project files to individual JSON files.
+    Project files records are appended to a single NDJSON file for the run, one record per line.
 
     Args:
         team_ids_file (str): Path to file containing team IDs (one per line)
         output_dir (str): Directory to save the JSON files (created if doesn't exist)
+        per_project_files (bool): Save each project's files to its own JSON file instead of the NDJSON file
 
     Returns:
         str: Summary message of the operation
@@ -541,87 +909,56 @@ def save_teams_with_project_files_to_json(team_ids_file: str = "team_ids", outpu
         saved_files = []
         total_projects = 0
         total_files = 0
+        run_ts = time.time()
+        batch_ts = int(run_ts)
+        project_files_path = os.path.join(output_dir, f"project_files_{batch_ts}.ndjson")
 
         for i, team_id in enumerate(team_ids, 1):
-            logger.info(f"Processing team {i}/{len(team_ids)}: {team_id}")
-
-            # Get team projects
-            team_response = get_team_projects(team_id)
-
-            if not team_response.get("error"):
-                projects = team_response.get("projects", [])
-                team_projects_with_files = []
-
-                logger.info(f"Found {len(projects)} projects in team {team_id}")
-                total_projects += len(projects)
-
-                # Get files for each project
-                for j, project in enumerate(projects, 1):
-                    project_id = project.get("id")
-                    project_name = project.get("name", "Unknown")
-
-                    logger.info(f"Processing project {j}/{len(projects)}: {project_name} ({project_id})")
-
-                    # Get files in this project
-                    files_response = get_files(project_id)
-
-                    if not files_response.get("error"):
-                        files = files_response.get("files", [])
-                        logger.info(f"Found {len(files)} files in project {project_name}")
-                        total_files += len(files)
-
-                        project_with_files = {
-                            "id": project_id,
-                            "name": project_name,
-                            "files": files,
-                            "file_count": len(files),
-                            "fetched_at": time.time()
-                        }
-
+            logger.info("Processing team %d/%d: %s", i, len(team_ids), team_id)
+
+            # Fetch the team's projects and their files; saved files record the team_ids source
+            team_data = fetch_team_bundle(team_id, run_ts)
+            status = team_data.pop("status")
+            team_data["source"] = team_ids_file
+
+            if status == "success":
+                total_projects += team_data["project_count"]
+                total_files += team_data["total_files"]
+
+                # Build this team's project files records from its successfully fetched projects
+                project_records = []
+                for project in team_data["projects"]:
+                    if project.get("error"):
+                        continue
+
+                    project_file_data = {
+                        "project": project,
+                        "team_id": team_id,
+                        "source": team_ids_file
+                    }
+
+                    if per_project_files:
                         # Save individual project files to separate JSON
-                        project_file_data = {
-                            "project": project_with_files,
-                            "team_id": team_id,
-                            "source": team_ids_file
-                        }
-
-                        saved_file = save_project_files_to_json(project_id, project_file_data, output_dir)
+                        saved_file = save_project_files_to_json(project["id"], project_file_data, output_dir, ts=batch_ts, seq=i, make_dir=False)
                         if not saved_file.startswith("Failed"):
                             saved_files.append(saved_file)
-
-                        team_projects_with_files.append(project_with_files)
                     else:
-                        logger.error(f"Failed to get files for project {project_name}: {files_response.get('message')}")
-                        project_with_files = {
-                            "id": project_id,
-                            "name": project_name,
-                            "error": True,
-                            "message": files_response.get("message"),
-                            "files": [],
-                            "file_count": 0,
-                            "fetched_at": time.time()
-                        }
-                        team_projects_with_files.append(project_with_files)
-
-                # Save team data with all projects and their files
-                team_data = {
-                    "id": team_id,
-                    "projects": team_projects_with_files,
-                    "project_count": len(team_projects_with_files),
-                    "total_files": sum(p.get("file_count", 0) for p in team_projects_with_files),
-                    "fetched_at": time.time(),
-                    "source": team_ids_file
-                }
+                        project_records.append(project_file_data)
+
+                # Append this team's project files records to the run's NDJSON file in one write batch
+                if project_records:
+                    saved_file = save_records_ndjson(project_records, project_files_path)
+                    if not saved_file.startswith("Failed") and saved_file not in saved_files:
+                        saved_files.append(saved_file)
 
                 # Save individual team file
-                saved_file = save_team_to_json(team_id, team_data, output_dir)
+                saved_file = save_team_to_json(team_id, team_data, output_dir, ts=batch_ts, seq=i, make_dir=False)
                 if not saved_file.startswith("Failed"):
                     saved_files.append(saved_file)
                     results["successful_teams"] += 1
-                    logger.info(f"Successfully processed team {team_id} with {team_data['project_count']} projects and {team_data['total_files']} files")
                 else:
                     results["failed_teams"] += 1
-                    logger.error(f"Failed to save team {team_id}: {saved_file}")
+                    logger.error("Failed to save team %s: %s", team_id, saved_file)
 
                 results["processed_teams"].append({
                     "id": team_id,
@@ -631,29 +968,17 @@ def save_teams_with_project_files_to_json(team_ids_file: str = "team_ids", outpu
                     "file": saved_file if not saved_file.startswith("Failed") else None
                 })
             else:
-                logger.error(f"Failed to get data for team {team_id}: {team_response.get('message')}")
                 results["failed_teams"] += 1
 
                 # Save error info to file as well
-                error_data = {
-                    "id": team_id,
-                    "error": True,
-                    "message": team_response.get("message"),
-                    "projects": [],
-                    "project_count": 0,
-                    "total_files": 0,
-                    "fetched_at": time.time(),
-                    "source": team_ids_file
-                }
-
-                saved_file = save_team_to_json(team_id, error_data, output_dir)
+                saved_file = save_team_to_json(team_id, team_data, output_dir, ts=batch_ts, seq=i, make_dir=False)
                 if not saved_file.startswith("Failed"):
                     saved_files.append(saved_file)
 
                 results["processed_teams"].append({
                     "id": team_id,
                     "status": "api_error",
-                    "error": team_response.get("message"),
+                    "error": team_data["message"],
                     "file": saved_file if not saved_file.startswith("Failed") else None
                 })
 
@@ -666,9 +991,9 @@ def save_teams_with_project_files_to_json(team_ids_file: str = "team_ids", outpu
             "timestamp": time.time()
         }
 
-        summary_filename = os.path.join(output_dir, f"teams_with_files_summary_{int(time.time())}.json")
-        with open(summary_filename, 'w') as f:
-            json.dump(summary_data, f, indent=2)
+        summary_filename = os.path.join(output_dir, f"teams_with_files_summary_{batch_ts}.json")
+        written = _write_json_file(summary_filename, summary_data)
+        logger.debug(f"Wrote {written} bytes to summary file")
 
         success_msg = (f"Processed {len(team_ids)} teams with {total_projects} projects and {total_files} files: "
                       f"{results['successful_teams']} successful teams, "
@@ -684,19 +1009,149 @@ def save_teams_with_project_files_to_json(team_ids_file: str = "team_ids", outpu
         logger.exception(error_msg)
         return error_msg
 
-def save_all_data_to_single_json(team_ids_file: str = "team_ids", output_dir: str = "data") -> str:
+def _ordered_map(executor: ThreadPoolExecutor, fn: Any, items: List[Any], window: int, *args: Any) -> Iterator[Any]:
+    """
+    Like executor.map(), but with at most `window` tasks submitted ahead of the result being consumed.
+    Results are yielded in input order; finished results waiting behind a slow item are bounded
+    by the window instead of growing with the whole input.
+    """
+    pending = collections.deque()
+    for item in items:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(fn, item, *args))
+    while pending:
+        yield pending.popleft().result()
+
+def fetch_team_bundle(team_id: str, run_ts: Optional[float] = None,
+                      session: Optional[requests.Session] = None) -> Dict[str, Any]:
+    """
+    Fetch a team's projects and the files in each project.
+    The project file listings are fetched concurrently.
+
+    Args:
+        team_id (str): The Figma team ID
+        run_ts (float): Timestamp used for every fetched_at field (defaults to now)
+        session (requests.Session): Session shared by all of the team's requests (defaults to the shared session)
+
+    Returns:
+        dict: Team data with all projects and their files, or an error entry if the team's projects could not be fetched
+    """
+    logger.info("Processing team %s", team_id)
+    if run_ts is None:
+        run_ts = time.time()
+
+    # Get team projects
+    team_response = get_team_projects(team_id, session)
+
+    if team_response.get("error"):
+        logger.error("Failed to get data for team %s: %s", team_id, team_response.get("message"))
+        return {
+            "id": team_id,
+            "status": "error",
+            **ERR_TEAM,
+            "projects": [],
+            "message": team_response.get("message"),
+            "fetched_at": run_ts
+        }
+
+    projects = team_response.get("projects", [])
+    # Pre-sized and filled by project index, so projects keep the API's order regardless of completion order
+    team_projects_with_files: List[Optional[Dict[str, Any]]] = [None] * len(projects)
+    team_total_files = 0
+
+    logger.info("Found %d projects in team %s", len(projects), team_id)
+
+    # Get files for each project concurrently
+    with ThreadPoolExecutor(max_workers=PROJECT_FETCH_WORKERS) as executor:
+        futures = {executor.submit(get_files, project.get("id"), session): index for index, project in enumerate(projects)}
+
+        for j, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            project = projects[index]
+            project_id = project.get("id")
+            project_name = project.get("name", "Unknown")
+
+            logger.info("Processing project %d/%d: %s (%s)", j, len(projects), project_name, project_id)
+
+            files_response = future.result()
+
+            if not files_response.get("error"):
+                files = files_response.get("files", [])
+                logger.info("Found %d files in project %s", len(files), project_name)
+
+                team_projects_with_files[index] = {
+                    "id": project_id,
+                    "name": project_name,
+                    "files": files,
+                    "file_count": len(files),
+                    "fetched_at": run_ts
+                }
+                team_total_files += len(files)
+            else:
+                logger.error("Failed to get files for project %s: %s", project_name, files_response.get("message"))
+                team_projects_with_files[index] = {
+                    "id": project_id,
+                    "name": project_name,
+                    **ERR_PROJECT,
+                    "files": [],
+                    "message": files_response.get("message"),
+                    "fetched_at": run_ts
+                }
+
+    team_data = {
+        "id": team_id,
+        "status": "success",
+        "projects": team_projects_with_files,
+        "project_count": len(team_projects_with_files),
+        "total_files": team_total_files,
+        "fetched_at": run_ts
+    }
+
+    logger.info("Successfully processed team %s with %d projects and %d files",
+                team_id, team_data["project_count"], team_data["total_files"])
+    return team_data
+
+def save_all_data_to_single_json(team_ids_file: str = "team_ids", output_dir: str = "data",
+                                 pretty: bool = False, output_format: str = "json",
+                                 compress: Optional[str] = None) -> str:
     """
     Read team IDs from file and save all teams, projects, and files data to a single consolidated JSON file.
 
+    With output_format="ndjson" the file holds one JSON object per line instead: a header line
+    {"metadata": {...}} with the source, team count and fetch time, one line per team, and a
+    footer line {"metadata": {...}} with the final totals.
+
+    With compress="gzip" or compress="zstd" the file is compressed as it is written and gets a
+    .gz or .zst suffix; zstd needs the optional zstandard package.
+
     Args:
         team_ids_file (str): Path to file containing team IDs (one per line)
         output_dir (str): Directory to save the JSON file (created if doesn't exist)
+        pretty (bool): Indent the JSON for reading by hand (slower and larger than the compact default)
+        output_format (str): "json" for a single JSON document or "ndjson" for line-delimited JSON
+        compress (str): None for an uncompressed file (default), "gzip" or "zstd"
 
     Returns:
         str: Path to the saved JSON file or error message
     """
     logger.info(f"Starting save_all_data_to_single_json with file: {team_ids_file}")
 
+    if output_format not in ("json", "ndjson"):
+        error_msg = f"Unsupported output format: {output_format}"
+        logger.error(error_msg)
+        return error_msg
+    ndjson = output_format == "ndjson"
+
+    if compress is not None and compress not in COMPRESSION_SUFFIXES:
+        error_msg = f"Unsupported compression: {compress}"
+        logger.error(error_msg)
+        return error_msg
+    if compress == "zstd" and zstd is None:
+        error_msg = "zstd compression requires the zstandard package"
+        logger.error(error_msg)
+        return error_msg
+
     try:
         # Get team IDs from file
         file_data = get_teams_from_file(team_ids_file)
@@ -712,134 +1167,201 @@ def save_all_data_to_single_json(team_ids_file: str = "team_ids", output_dir: st
         logger.debug(f"Creating directory if it doesn't exist: {output_dir}")
         os.makedirs(output_dir, exist_ok=True)
 
-        # Initialize consolidated data structure
-        consolidated_data = {
-            "metadata": {
-                "source": team_ids_file,
-                "total_teams": len(team_ids),
-                "fetched_at": time.time(),
-                "successful_teams": 0,
-                "failed_teams": 0,
-                "total_projects": 0,
-                "total_files": 0
-            },
-            "teams": []
+        # Capture the run timestamp once and reuse it for every fetched_at field
+        run_ts = time.time()
+
+        # Initialize consolidated metadata (team data is streamed to the file below)
+        meta = {
+            "source": team_ids_file,
+            "total_teams": len(team_ids),
+            "fetched_at": run_ts,
+            "successful_teams": 0,
+            "failed_teams": 0,
+            "total_projects": 0,
+            "total_files": 0
         }
 
-        # Process each team individually
-        for i, team_id in enumerate(team_ids, 1):
-            logger.info(f"Processing team {i}/{len(team_ids)}: {team_id}")
+        # Stream teams to the consolidated file as they finish so only one team's data is held
+        # in memory. Metadata is written after the teams array, once the totals are known.
+        timestamp = int(run_ts)
+        filename = os.path.join(output_dir, f"figma_consolidated_data_{timestamp}.{output_format}")
+        if compress is not None:
+            filename += COMPRESSION_SUFFIXES[compress]
+        logger.info(f"Streaming consolidated data to file: {filename}")
+
+        with _atomic_write(filename, buffering=WRITE_BUFFER_SIZE) as raw, _compressed_writer(raw, compress) as f:
+            if ndjson:
+                header = {key: meta[key] for key in ("source", "total_teams", "fetched_at")}
+                f.write(_json_dumps({"metadata": header}, indent=False) + b"\n")
+            else:
+                f.write(b'{"teams": [\n')
+
+            # Fetch teams concurrently, yielded in team_ids order so the output stays deterministic
+            with ThreadPoolExecutor(max_workers=TEAM_FETCH_WORKERS) as executor:
+                teams = _ordered_map(executor, fetch_team_bundle, team_ids, TEAM_FETCH_WINDOW, run_ts)
+                for i, team_data in enumerate(teams, 1):
+                    logger.info("Finished team %d/%d: %s", i, len(team_ids), team_data["id"])
+
+                    if team_data["status"] == "success":
+                        meta["successful_teams"] += 1
+                        meta["total_projects"] += team_data["project_count"]
+                        meta["total_files"] += team_data["total_files"]
+                    else:
+                        meta["failed_teams"] += 1
 
-            # Get team projects
-            team_response = get_team_projects(team_id)
+                    # Append the finished team to the stream so it can be released before the next one
+                    if ndjson:
+                        f.write(_json_dumps(team_data, indent=False) + b"\n")
+                    else:
+                        if i > 1:
+                            f.write(b",\n")
+                        f.write(_json_dumps(team_data, indent=pretty))
 
-            if not team_response.get("error"):
-                projects = team_response.get("projects", [])
-                team_projects_with_files = []
+                    # Release the team before blocking on the next one
+                    del team_data
+
+            if ndjson:
+                f.write(_json_dumps({"metadata": meta}, indent=False) + b"\n")
+            else:
+                f.write(b'\n], "metadata": ')
+                f.write(_json_dumps(meta, indent=pretty))
+                f.write(b"}\n")
+        written = os.path.getsize(filename)
 
-                logger.info(f"Found {len(projects)} projects in team {team_id}")
-                consolidated_data["metadata"]["total_projects"] += len(projects)
+        logger.debug(f"Wrote {written} bytes to consolidated file")
 
-                # Get files for each project
-                for j, project in enumerate(projects, 1):
-                    project_id = project.get("id")
-                    project_name = project.get("name", "Unknown")
+        success_msg = (f"Consolidated data saved to {filename}. "
+                      f"Processed {meta['total_teams']} teams: "
+                      f"{meta['successful_teams']} successful, "
+                      f"{meta['failed_teams']} failed. "
+                      f"Total: {meta['total_projects']} projects, "
+                      f"{meta['total_files']} files.")
 
-                    logger.info(f"Processing project {j}/{len(projects)}: {project_name} ({project_id})")
+        logger.info(success_msg)
+        return success_msg
 
-                    # Get files in this project
-                    files_response = get_files(project_id)
+    except Exception as e:
+        error_msg = f"Failed to save consolidated data: {str(e)}"
+        logger.exception(error_msg)
+        return error_msg
 
-                    if not files_response.get("error"):
-                        files = files_response.get("files", [])
-                        logger.info(f"Found {len(files)} files in project {project_name}")
-                        consolidated_data["metadata"]["total_files"] += len(files)
 
-                        project_with_files = {
-                            "id": project_id,
-                            "name": project_name,
-                            "files": files,
-                            "file_count": len(files),
-                            "fetched_at": time.time()
-                        }
+def _fetch_team_shard(team_id: str, seq: int, run_ts: float, output_dir: str, pretty: bool) -> Dict[str, Any]:
+    """
+    Fetch one team and write it to its own shard file.
 
-                        team_projects_with_files.append(project_with_files)
-                    else:
-                        logger.error(f"Failed to get files for project {project_name}: {files_response.get('message')}")
-                        project_with_files = {
-                            "id": project_id,
-                            "name": project_name,
-                            "error": True,
-                            "message": files_response.get("message"),
-                            "files": [],
-                            "file_count": 0,
-                            "fetched_at": time.time()
-                        }
-                        team_projects_with_files.append(project_with_files)
-
-                # Add team data to consolidated structure
-                team_data = {
-                    "id": team_id,
-                    "status": "success",
-                    "projects": team_projects_with_files,
-                    "project_count": len(team_projects_with_files),
-                    "total_files": sum(p.get("file_count", 0) for p in team_projects_with_files),
-                    "fetched_at": time.time()
-                }
+    Returns:
+        dict: Index entry describing the team and its shard file
+    """
+    team_data = fetch_team_bundle(team_id, run_ts)
+    index_entry = {
+        "id": team_id,
+        "status": team_data["status"],
+        "project_count": team_data["project_count"],
+        "total_files": team_data["total_files"]
+    }
 
-                consolidated_data["teams"].append(team_data)
-                consolidated_data["metadata"]["successful_teams"] += 1
-                logger.info(f"Successfully processed team {team_id} with {team_data['project_count']} projects and {team_data['total_files']} files")
+    filename = os.path.join(output_dir, f"figma_team_{team_id}_{int(run_ts)}_{seq}.json")
+    try:
+        written = _write_json_file(filename, team_data, indent=pretty)
+        logger.info("Saved team %s shard (%d bytes) to %s", team_id, written, filename)
+        index_entry["file"] = filename
+    except OSError as e:
+        logger.error("Failed to save team %s shard to %s: %s", team_id, filename, e)
+        index_entry["status"] = "save_failed"
+        index_entry["file"] = None
+
+    return index_entry
+
+def save_all_data_to_sharded_json(team_ids_file: str = "team_ids", output_dir: str = "data",
+                                  pretty: bool = False) -> str:
+    """
+    Read team IDs from file and save each team's projects and files to its own JSON shard,
+    plus a small index file with the aggregate counts and the shard written for each team.
+    Shards are written by the team workers as soon as each team is fetched.
 
-            else:
-                logger.error(f"Failed to get data for team {team_id}: {team_response.get('message')}")
-                consolidated_data["metadata"]["failed_teams"] += 1
+    Args:
+        team_ids_file (str): Path to file containing team IDs (one per line)
+        output_dir (str): Directory to save the JSON files (created if doesn't exist)
+        pretty (bool): Indent the JSON for reading by hand (slower and larger than the compact default)
 
-                # Add error team data to consolidated structure
-                error_team_data = {
-                    "id": team_id,
-                    "status": "error",
-                    "error": True,
-                    "message": team_response.get("message"),
-                    "projects": [],
-                    "project_count": 0,
-                    "total_files": 0,
-                    "fetched_at": time.time()
-                }
+    Returns:
+        str: Summary message of the operation or error message
+    """
+    logger.info(f"Starting save_all_data_to_sharded_json with file: {team_ids_file}")
 
-                consolidated_data["teams"].append(error_team_data)
+    try:
+        # Get team IDs from file
+        file_data = get_teams_from_file(team_ids_file)
 
-        # Create consolidated filename with timestamp
-        timestamp = int(time.time())
-        filename = os.path.join(output_dir, f"figma_consolidated_data_{timestamp}.json")
-        logger.info(f"Saving consolidated data to file: {filename}")
+        if file_data.get("error"):
+            error_msg = f"Error reading teams from file: {file_data.get('message')}"
+            logger.error(error_msg)
+            return error_msg
 
-        # Write the consolidated JSON data to file
-        logger.debug(f"Writing {len(json.dumps(consolidated_data))} bytes to consolidated file")
-        with open(filename, 'w') as f:
-            json.dump(consolidated_data, f, indent=2)
+        team_ids = file_data.get("team_ids", [])
 
-        success_msg = (f"Consolidated data saved to {filename}. "
-                      f"Processed {consolidated_data['metadata']['total_teams']} teams: "
-                      f"{consolidated_data['metadata']['successful_teams']} successful, "
-                      f"{consolidated_data['metadata']['failed_teams']} failed. "
-                      f"Total: {consolidated_data['metadata']['total_projects']} projects, "
-                      f"{consolidated_data['metadata']['total_files']} files.")
+        # Create output directory if it doesn't exist
+        logger.debug(f"Creating directory if it doesn't exist: {output_dir}")
+        os.makedirs(output_dir, exist_ok=True)
+
+        run_ts = time.time()
+        metadata = {
+            "source": team_ids_file,
+            "total_teams": len(team_ids),
+            "fetched_at": run_ts,
+            "successful_teams": 0,
+            "failed_teams": 0,
+            "total_projects": 0,
+            "total_files": 0
+        }
+
+        # Fetch and write teams concurrently; map() keeps the index in team_ids order
+        with ThreadPoolExecutor(max_workers=TEAM_FETCH_WORKERS) as executor:
+            index_entries = list(executor.map(_fetch_team_shard, team_ids, range(1, len(team_ids) + 1),
+                                              itertools.repeat(run_ts), itertools.repeat(output_dir),
+                                              itertools.repeat(pretty)))
+
+        for entry in index_entries:
+            if entry["status"] == "success":
+                metadata["successful_teams"] += 1
+                metadata["total_projects"] += entry["project_count"]
+                metadata["total_files"] += entry["total_files"]
+            else:
+                metadata["failed_teams"] += 1
+
+        index_filename = os.path.join(output_dir, f"figma_index_{int(run_ts)}.json")
+        written = _write_json_file(index_filename, {"metadata": metadata, "teams": index_entries}, indent=pretty)
+        logger.debug(f"Wrote {written} bytes to index file")
+
+        success_msg = (f"Team shards saved to {output_dir}, index saved to {index_filename}. "
+                      f"Processed {metadata['total_teams']} teams: "
+                      f"{metadata['successful_teams']} successful, "
+                      f"{metadata['failed_teams']} failed. "
+                      f"Total: {metadata['total_projects']} projects, "
+                      f"{metadata['total_files']} files.")
 
         logger.info(success_msg)
         return success_msg
 
     except Exception as e:
-        error_msg = f"Failed to save consolidated data: {str(e)}"
+        error_msg = f"Failed to save sharded data: {str(e)}"
         logger.exception(error_msg)
         return error_msg
 
 
-if __name__ == "__main__":
+def main() -> int:
+    """
+    Run the export: consolidate all data for the teams in ./team_ids when that file exists,
+    otherwise fall back to the teams visible through the /me endpoint.
+
+    Returns:
+        int: Process exit code (0 on success, 1 if the export failed)
+    """
     logger.info("Script started")
 
     # Check if team_ids file exists and use it, otherwise use the /me endpoint
-    if os.path.exists("team_ids"):
+    if pathlib.Path("team_ids").is_file():
         logger.info("Found team_ids file, creating consolidated JSON with all data")
         result = save_all_data_to_single_json()
     else:
@@ -848,3 +1370,7 @@ if __name__ == "__main__":
 
     print(result)
     logger.info("Script completed")
+    return 1 if result.startswith(("Failed", "Error")) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())